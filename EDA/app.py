@@ -1,8 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import seaborn as sns
+import matplotlib
+matplotlib.use("Agg")  # Server-side rendering only; skip GUI backend initialization
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import warnings
+import hashlib
+import io
+
+try:
+    from numba import njit  # JIT-compiles the per-group kernels when installed
+except ImportError:
+    def njit(*args, **kwargs):
+        # Without numba the kernels run as plain Python functions
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 # Suppress warnings and set style
 warnings.filterwarnings("ignore")
@@ -19,20 +34,56 @@ st.set_page_config(
 st.title("🌾 ICRISAT District-Level Agricultural Data Analysis")
 st.markdown("### Explore crop production, yield, and area trends across Indian states")
 
+# --- STATE COLUMN HANDLING ---
+STATE_NAME = 'tate name'
+YEAR = 'year'
+DISTRICT_NAME = 'di_t name'
+
+# --- Helper: CSV Loading ---
+def _read_csv(src):
+    """Reads a CSV with the multithreaded PyArrow parser, falling back to the C engine."""
+    try:
+        return pd.read_csv(src, engine="pyarrow", dtype_backend="pyarrow")
+    except Exception:
+        # pyarrow missing or unsupported pandas version; rewind any partially read buffer
+        if hasattr(src, "seek"):
+            src.seek(0)
+        return pd.read_csv(src, engine="c", low_memory=False, cache_dates=True)
+
+# --- Helper: Load and Clean (cached per file hash) ---
+@st.cache_data(show_spinner=False)
+def load_and_clean(_file_bytes: bytes, file_hash: str, file_name: str):
+    """
+    Parses the uploaded file and zero-fills production/area/yield columns once per
+    upload. The bytes are underscore-prefixed so Streamlit keys the cache on the
+    precomputed hash instead of rehashing the whole file.
+    """
+    if file_name.endswith(".parquet"):
+        df = pd.read_parquet(io.BytesIO(_file_bytes))
+    else:
+        df = _read_csv(io.BytesIO(_file_bytes))
+    prod_area_yield_cols = [col for col in df.columns if 'production' in col or 'area' in col or 'yield' in col]
+    df[prod_area_yield_cols] = df[prod_area_yield_cols].fillna(0)
+    # Group keys as categories, so groupbys hash small integer codes instead of strings
+    for col in (STATE_NAME, DISTRICT_NAME):
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
 # --- Sidebar: File Upload & Navigation ---
 st.sidebar.header("📂 Upload Dataset")
-uploaded_file = st.sidebar.file_uploader("Upload ICRISAT CSV file", type=["csv"])
+uploaded_file = st.sidebar.file_uploader("Upload ICRISAT CSV or Parquet file", type=["csv", "parquet"])
 
 if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
+    # getvalue() returns the whole buffer without moving its read position
+    raw = uploaded_file.getvalue()
+    # Fingerprint of the uploaded file, used as the cache key for loading and aggregations
+    file_hash = hashlib.sha1(raw).hexdigest()
+    df = load_and_clean(raw, file_hash, uploaded_file.name)
 else:
     st.warning("Please upload the **ICRISAT_District_Level_Data_Cleaned.csv** file to continue.")
     st.stop()
 
-# --- Data Cleaning ---
-prod_area_yield_cols = [col for col in df.columns if 'production' in col or 'area' in col or 'yield' in col]
-df[prod_area_yield_cols] = df[prod_area_yield_cols].fillna(0)
-
 # --- Sidebar Navigation ---
 st.sidebar.header("🔍 Choose EDA Visualization")
 eda_options = [
@@ -48,41 +99,123 @@ eda_options = [
     "Soybean Production & Yield Efficiency",
     "Top 10 Oilseed Producing States",
     "Area vs Production (Rice/Wheat/Maize)",
-    "Rice vs Wheat Yield by State"
+    "Rice vs Wheat Yield by State",
+    "Cotton Production Growth (Top 5 States)"
 ]
 selected_analysis = st.sidebar.selectbox("Select Analysis:", eda_options)
 
-# --- Helper: Plot Function Wrapper ---
+# --- Helper: Plot Function Wrappers ---
+def get_fig(figsize, nrows=1, ncols=1):
+    """
+    Returns a cleared (Figure, Axes) pair for the given shape. Figures are kept in
+    the session state so reruns reuse them instead of rebuilding canvas and tick
+    machinery on every draw.
+    """
+    cache = st.session_state.setdefault("_fig_cache", {})
+    key = (figsize, nrows, ncols)
+    if key not in cache:
+        fig = Figure(figsize=figsize)
+        cache[key] = (fig, fig.subplots(nrows, ncols))
+    fig, axes = cache[key]
+    for ax in np.atleast_1d(axes):
+        ax.clear()
+        # clear() keeps tick parameters, so undo any rotation from a previous draw
+        ax.tick_params(axis='both', labelrotation=0)
+    return fig, axes
+
+def bar_plot(ax, series, palette):
+    """Draws an already-aggregated Series as bars, one palette colour per bar."""
+    positions = np.arange(len(series))
+    # Match sns.barplot: 75% saturation, bars on integer positions with
+    # half-unit padding and no grid along the category axis
+    ax.bar(positions, series.values, color=sns.color_palette(palette, len(series), desat=0.75))
+    ax.set_xticks(positions, series.index.astype(str))
+    ax.set_xlim(-0.5, len(series) - 0.5)
+    ax.xaxis.grid(False)
+    ax.set_xlabel(series.index.name or "")
+
 def show_plot(fig):
-    st.pyplot(fig)
-    plt.close(fig)
+    # The figure is reused by get_fig, so it is neither cleared nor closed here
+    st.pyplot(fig, clear_figure=False)
 
-# --- STATE COLUMN HANDLING ---
-STATE_NAME = 'tate name'
-YEAR = 'year'
-DISTRICT_NAME = 'di_t name'
+# Production columns summed per state by the "Top N" and stacked analyses
+PROD_COLS = [
+    'rice production _production_1000ton',
+    'wheat production _production_1000ton',
+    'oil_eed_ production _production_1000ton',
+    'unflower production _production_1000ton',
+    'kharif _orghum production _production_1000ton',
+    'rabi _orghum production _production_1000ton',
+    'groundnut production _production_1000ton',
+    'oyabean production _production_1000ton',
+    'cotton production _production_1000ton'
+]
+
+# --- Cached Aggregations (keyed on the uploaded file's hash) ---
+# The DataFrame argument is underscore-prefixed so Streamlit skips hashing it;
+# the file hash identifies the data instead.
+@st.cache_data(show_spinner=False)
+def state_totals(_df, df_hash):
+    # One groupby pass for every crop; branches slice the column they need
+    return _df.groupby(STATE_NAME, observed=True)[PROD_COLS].sum()
+
+@st.cache_data(show_spinner=False)
+def year_sum(_df, df_hash, cols):
+    return _df.groupby(YEAR, observed=True)[list(cols)].sum().reset_index()
+
+# --- Per-Group Kernels ---
+@njit(cache=True)
+def mean_growth_by_group(codes, values, n_groups):
+    """
+    Average year-over-year growth rate per group. `codes` and `values` must be
+    sorted by (group, year); steps whose previous value is not positive are skipped.
+    """
+    sums = np.zeros(n_groups)
+    counts = np.zeros(n_groups, np.int64)
+    for i in range(1, len(codes)):
+        prev = values[i - 1]
+        if codes[i] == codes[i - 1] and prev > 0:
+            sums[codes[i]] += (values[i] - prev) / prev
+            counts[codes[i]] += 1
+    out = np.full(n_groups, np.nan)
+    for g in range(n_groups):
+        if counts[g] > 0:
+            out[g] = sums[g] / counts[g]
+    return out
+
+@st.cache_data(show_spinner=False)
+def state_growth(_df, df_hash, col):
+    # State-year totals come back sorted by (state, year), as the kernel expects
+    state_year = _df.groupby([STATE_NAME, YEAR], observed=True)[col].sum()
+    states = state_year.index.levels[0]
+    growth = mean_growth_by_group(
+        state_year.index.codes[0].astype(np.int64),
+        state_year.to_numpy(dtype='float64'),
+        len(states)
+    )
+    return pd.Series(growth * 100, index=states)
 
 # --- Visualization Logic ---
 if selected_analysis == "Top 7 Rice Producing States":
-    rice_prod_state = df.groupby(STATE_NAME)['rice production _production_1000ton'].sum().nlargest(7)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=rice_prod_state.index, y=rice_prod_state.values, ax=ax, palette="Blues_d")
+    rice_prod_state = state_totals(df, file_hash)['rice production _production_1000ton'].nlargest(7)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, rice_prod_state, "Blues_d")
     ax.set_title("Top 7 Rice Producing States")
     ax.set_xlabel("State")
     ax.set_ylabel("Rice Production (1000 tons)")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
     show_plot(fig)
 
 elif selected_analysis == "Top 5 Wheat Producing States":
-    wheat_prod_state = df.groupby(STATE_NAME)['wheat production _production_1000ton'].sum().nlargest(5)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=wheat_prod_state.index, y=wheat_prod_state.values, ax=ax, palette="Reds_d")
+    wheat_prod_state = state_totals(df, file_hash)['wheat production _production_1000ton'].nlargest(5)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, wheat_prod_state, "Reds_d")
     ax.set_title("Top 5 Wheat Producing States")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
     show_plot(fig)
 
     # Pie chart
-    fig2, ax2 = plt.subplots(figsize=(6, 6))
+    fig2, ax2 = get_fig((6, 6))
     total = df['wheat production _production_1000ton'].sum()
     perc = (wheat_prod_state / total) * 100
     ax2.pie(perc, labels=perc.index, autopct="%1.1f%%", startangle=140)
@@ -90,96 +223,99 @@ elif selected_analysis == "Top 5 Wheat Producing States":
     show_plot(fig2)
 
 elif selected_analysis == "Top 5 Oilseed Producing States":
-    oilseed_prod_state = df.groupby(STATE_NAME)['oil_eed_ production _production_1000ton'].sum().nlargest(5)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=oilseed_prod_state.index, y=oilseed_prod_state.values, ax=ax, palette="Greens_d")
+    oilseed_prod_state = state_totals(df, file_hash)['oil_eed_ production _production_1000ton'].nlargest(5)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, oilseed_prod_state, "Greens_d")
     ax.set_title("Top 5 Oilseed Producing States")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
     show_plot(fig)
 
 elif selected_analysis == "Top 7 Sunflower Producing States":
-    sunflower_prod_state = df.groupby(STATE_NAME)['unflower production _production_1000ton'].sum().nlargest(7)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=sunflower_prod_state.index, y=sunflower_prod_state.values, ax=ax, palette="YlOrRd_d")
+    sunflower_prod_state = state_totals(df, file_hash)['unflower production _production_1000ton'].nlargest(7)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, sunflower_prod_state, "YlOrRd_d")
     ax.set_title("Top 7 Sunflower Producing States")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
     show_plot(fig)
 
 elif selected_analysis == "Sugarcane, Rice & Wheat Time Series":
-    ts = df.groupby(YEAR)[['ugarcane production _production_1000ton',
-                           'rice production _production_1000ton',
-                           'wheat production _production_1000ton']].sum().reset_index()
-
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.lineplot(data=ts, x=YEAR, y='ugarcane production _production_1000ton', label='Sugarcane')
-    sns.lineplot(data=ts, x=YEAR, y='rice production _production_1000ton', label='Rice')
-    sns.lineplot(data=ts, x=YEAR, y='wheat production _production_1000ton', label='Wheat')
+    ts = year_sum(df, file_hash, ('ugarcane production _production_1000ton',
+                                  'rice production _production_1000ton',
+                                  'wheat production _production_1000ton'))
+
+    fig, ax = get_fig((12, 6))
+    ax.plot(ts[YEAR], ts['ugarcane production _production_1000ton'], label='Sugarcane')
+    ax.plot(ts[YEAR], ts['rice production _production_1000ton'], label='Rice')
+    ax.plot(ts[YEAR], ts['wheat production _production_1000ton'], label='Wheat')
+    ax.set_xlabel(YEAR)
     ax.set_title("Production Trends Over Time")
     ax.legend()
     show_plot(fig)
 
 elif selected_analysis == "West Bengal Rice Production by District":
     wb = df[df[STATE_NAME] == 'West Bengal']
-    wb_rice = wb.groupby(DISTRICT_NAME)['rice production _production_1000ton'].sum().nlargest(10)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=wb_rice.index, y=wb_rice.values, ax=ax, palette="Oranges_d")
+    wb_rice = wb.groupby(DISTRICT_NAME, observed=True)['rice production _production_1000ton'].sum().nlargest(10)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, wb_rice, "Oranges_d")
     ax.set_title("Rice Production by District (West Bengal)")
-    plt.xticks(rotation=60)
+    ax.tick_params(axis='x', labelrotation=60)
     show_plot(fig)
 
 elif selected_analysis == "UP - Top 10 Wheat Production Years":
     up = df[df[STATE_NAME] == 'Uttar Pradesh']
-    up_year = up.groupby(YEAR)['wheat production _production_1000ton'].sum().nlargest(10)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=up_year.index.astype(str), y=up_year.values, ax=ax, palette="Purples_d")
+    up_year = up.groupby(YEAR, observed=True)['wheat production _production_1000ton'].sum().nlargest(10)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, up_year, "Purples_d")
     ax.set_title("Top 10 Wheat Production Years (Uttar Pradesh)")
     show_plot(fig)
 
 elif selected_analysis == "Sorghum Production by State":
-    sorghum = df.groupby(STATE_NAME)[['kharif _orghum production _production_1000ton',
-                                      'rabi _orghum production _production_1000ton']].sum()
-    fig, ax = plt.subplots(figsize=(12, 6))
+    sorghum = state_totals(df, file_hash)[['kharif _orghum production _production_1000ton',
+                                           'rabi _orghum production _production_1000ton']]
+    fig, ax = get_fig((12, 6))
     sorghum.plot(kind='bar', stacked=True, ax=ax, colormap='tab10')
     ax.set_title("Sorghum Production (Kharif & Rabi)")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
     show_plot(fig)
 
 elif selected_analysis == "Top 7 Groundnut Producing States":
-    groundnut = df.groupby(STATE_NAME)['groundnut production _production_1000ton'].sum().nlargest(7)
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=groundnut.index, y=groundnut.values, ax=ax, palette="coolwarm")
+    groundnut = state_totals(df, file_hash)['groundnut production _production_1000ton'].nlargest(7)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, groundnut, "coolwarm")
     ax.set_title("Top 7 Groundnut Producing States")
     show_plot(fig)
 
 elif selected_analysis == "Soybean Production & Yield Efficiency":
-    soy = df.groupby(STATE_NAME).agg({
-        'oyabean production _production_1000ton': 'sum',
-        'oyabean yield _yield_kg_per_ha': 'mean'
-    }).reset_index()
+    soy = pd.concat([
+        state_totals(df, file_hash)['oyabean production _production_1000ton'],
+        df.groupby(STATE_NAME, observed=True)['oyabean yield _yield_kg_per_ha'].mean()
+    ], axis=1).reset_index()
     top5 = soy.nlargest(5, 'oyabean production _production_1000ton')
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=STATE_NAME, y='oyabean production _production_1000ton', data=top5, palette="plasma", ax=ax)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, top5.set_index(STATE_NAME)['oyabean production _production_1000ton'], "plasma")
+    ax.set_ylabel('oyabean production _production_1000ton')
     ax.set_title("Top 5 Soybean Producing States")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
     show_plot(fig)
 
-    fig2, ax2 = plt.subplots(figsize=(10, 6))
-    sns.barplot(x=STATE_NAME, y='oyabean yield _yield_kg_per_ha', data=top5, palette="viridis", ax=ax2)
+    fig2, ax2 = get_fig((10, 6))
+    bar_plot(ax2, top5.set_index(STATE_NAME)['oyabean yield _yield_kg_per_ha'], "viridis")
+    ax2.set_ylabel('oyabean yield _yield_kg_per_ha')
     ax2.set_title("Average Soybean Yield Efficiency")
-    plt.xticks(rotation=45)
+    ax2.tick_params(axis='x', labelrotation=45)
     show_plot(fig2)
 
 elif selected_analysis == "Top 10 Oilseed Producing States":
-    oil10 = df.groupby(STATE_NAME)['oil_eed_ production _production_1000ton'].sum().nlargest(10)
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.barplot(x=oil10.index, y=oil10.values, ax=ax, palette="Oranges")
+    oil10 = state_totals(df, file_hash)['oil_eed_ production _production_1000ton'].nlargest(10)
+    fig, ax = get_fig((12, 6))
+    bar_plot(ax, oil10, "Oranges")
     ax.set_title("Top 10 Oilseed Producing States")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
     show_plot(fig)
 
 elif selected_analysis == "Area vs Production (Rice/Wheat/Maize)":
-    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    fig, axes = get_fig((18, 6), 1, 3)
     sns.scatterplot(x='rice area _area_1000ha', y='rice production _production_1000ton', data=df, ax=axes[0], color='green')
     sns.scatterplot(x='wheat area _area_1000ha', y='wheat production _production_1000ton', data=df, ax=axes[1], color='red')
     sns.scatterplot(x='maize area _area_1000ha', y='maize production _production_1000ton', data=df, ax=axes[2], color='blue')
@@ -189,11 +325,22 @@ elif selected_analysis == "Area vs Production (Rice/Wheat/Maize)":
     show_plot(fig)
 
 elif selected_analysis == "Rice vs Wheat Yield by State":
-    yield_df = df.groupby(STATE_NAME)[['rice yield _yield_kg_per_ha', 'wheat yield _yield_kg_per_ha']].mean()
-    fig, ax = plt.subplots(figsize=(14, 7))
+    yield_df = df.groupby(STATE_NAME, observed=True)[['rice yield _yield_kg_per_ha', 'wheat yield _yield_kg_per_ha']].mean()
+    fig, ax = get_fig((14, 7))
     yield_df.plot(kind='bar', ax=ax, colormap='Accent')
     ax.set_title("Rice vs Wheat Yield (Average per State)")
-    plt.xticks(rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
+    show_plot(fig)
+
+elif selected_analysis == "Cotton Production Growth (Top 5 States)":
+    top_cotton = state_totals(df, file_hash)['cotton production _production_1000ton'].nlargest(5).index
+    growth = state_growth(df, file_hash, 'cotton production _production_1000ton')
+    growth = growth.reindex(top_cotton).sort_values(ascending=False)
+    fig, ax = get_fig((10, 6))
+    bar_plot(ax, growth, "BuGn_d")
+    ax.set_title("Average Annual Cotton Production Growth (Top 5 States)")
+    ax.set_ylabel("Growth Rate (%)")
+    ax.tick_params(axis='x', labelrotation=45)
     show_plot(fig)
 
 st.success("✅ Analysis Complete — Choose another visualization from the sidebar!")
@@ -1,37 +1,63 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sqlite3
 import warnings
 import re
 import os
 
+try:
+    import duckdb  # Vectorized, columnar query engine (preferred when installed)
+except ImportError:
+    duckdb = None
+
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
 # --- 1. Database Setup and Data Loading (Encapsulated for Streamlit) ---
 
+# Bound-parameter limit per statement, which caps rows per multi-row INSERT
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+def _read_csv(src):
+    """Reads a CSV with the multithreaded PyArrow parser, falling back to the C engine."""
+    try:
+        return pd.read_csv(src, engine='pyarrow', dtype_backend='pyarrow')
+    except Exception:
+        # pyarrow missing or unsupported pandas version
+        return pd.read_csv(src, engine='c', low_memory=False, cache_dates=True)
+
+
+def source_file(csv_file: str) -> str:
+    """Returns the Parquet sibling written by the cleaning step if present, else the CSV."""
+    parquet_file = os.path.splitext(csv_file)[0] + '.parquet'
+    return parquet_file if os.path.exists(parquet_file) else csv_file
+
+
 @st.cache_resource
 def initialize_database(csv_file: str):
     """
-    Connects to a file-based SQLite database, loads the CSV,
-    cleans the data, renames columns, and writes it to the database.
+    Loads the CSV, cleans the data and renames columns, then loads it into an
+    in-memory DuckDB database or, when DuckDB is not installed, writes it to a
+    file-based SQLite database.
     This function is cached by Streamlit to run only once.
     """
-    DB_NAME = 'temp_icrisat.db'  # Persistent database file
+    DB_NAME = 'temp_icrisat.db'  # Persistent database file (SQLite fallback)
     TABLE_NAME = 'ICRISAT_District_Level_Data_Cleaned'
 
     try:
-        # Connect to the SQLite database (thread-safe)
-        conn = sqlite3.connect(DB_NAME, check_same_thread=False)
-        cursor = conn.cursor()
-
         # Check if the CSV file exists
         if not os.path.exists(csv_file):
             st.error(f"Error: The file '{csv_file}' was not found. Please ensure it is in the same directory.")
             return None, None  # Return None if setup fails
 
-        # Load the CSV into a Pandas DataFrame
-        df = pd.read_csv(csv_file)
+        # Load the data into a Pandas DataFrame, preferring the Parquet sibling
+        # written by the cleaning step since it is already typed and columnar
+        data_file = source_file(csv_file)
+        if data_file.endswith('.parquet'):
+            df = pd.read_parquet(data_file)
+        else:
+            df = _read_csv(csv_file)
 
         # Normalize column names: strip whitespace
         df.columns = [c.strip() for c in df.columns]
@@ -70,6 +96,10 @@ def initialize_database(csv_file: str):
             (['oilseed', 'production'], 'OilseedProd'),
             (['cotton', 'production'], 'CottonProd'),
             (['groundnut', 'production'], 'GroundnutProd'),
+            (['maize', 'production'], 'MaizeProd'),
+            (['rice', 'area'], 'RiceArea'),
+            (['wheat', 'area'], 'WheatArea'),
+            (['maize', 'area'], 'MaizeArea'),
             (['maize', 'yield'], 'MaizeYield'),
             (['rice', 'yield'], 'RiceYield'),
             (['wheat', 'yield'], 'WheatYield'),
@@ -92,11 +122,48 @@ def initialize_database(csv_file: str):
         if prod_area_yield_cols:
             df[prod_area_yield_cols] = df[prod_area_yield_cols].fillna(0)
 
-        # Write the cleaned DataFrame to the SQLite table
-        df.to_sql(TABLE_NAME, conn, if_exists='replace', index=False)
+        if duckdb is not None:
+            # Columnar bulk load straight from the DataFrame (no row-wise INSERTs);
+            # a real table rather than a view so per-query cursors can see it
+            conn = duckdb.connect()
+            conn.register('df_view', df)
+            conn.execute(f"CREATE OR REPLACE TABLE {TABLE_NAME} AS SELECT * FROM df_view")
+            conn.unregister('df_view')
+        else:
+            # Connect to the SQLite database (thread-safe)
+            conn = sqlite3.connect(DB_NAME, check_same_thread=False)
+
+            # The table is rebuilt from the CSV on every start, so durability
+            # is not needed while bulk loading
+            conn.executescript("""
+                PRAGMA journal_mode=OFF;
+                PRAGMA synchronous=OFF;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA locking_mode=EXCLUSIVE;
+            """)
+
+            # Write the cleaned DataFrame to the SQLite table with multi-row INSERTs
+            df.to_sql(
+                TABLE_NAME, conn, if_exists='replace', index=False,
+                method='multi', chunksize=max(1, SQLITE_MAX_VARIABLES // len(df.columns))
+            )
+
+            # Index the filter/group/join keys so queries avoid full table scans,
+            # restore normal locking and journaling, and give SQLite a larger
+            # page cache (~200 MB) for query time
+            conn.executescript(f"""
+                PRAGMA locking_mode=NORMAL;
+                CREATE INDEX IF NOT EXISTS ix_state ON {TABLE_NAME}(StateName);
+                CREATE INDEX IF NOT EXISTS ix_year ON {TABLE_NAME}(Year);
+                CREATE INDEX IF NOT EXISTS ix_district ON {TABLE_NAME}(DistrictName);
+                CREATE INDEX IF NOT EXISTS ix_state_year ON {TABLE_NAME}(StateName, Year);
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA cache_size=-200000;
+            """)
 
         # Get MAX Year for use in queries
-        max_year_result = cursor.execute(f"SELECT MAX(Year) FROM {TABLE_NAME}").fetchone()
+        max_year_result = conn.execute(f"SELECT MAX(Year) FROM {TABLE_NAME}").fetchone()
         MAX_YEAR = max_year_result[0]
 
         st.success(f"✅ Database setup complete. Data loaded for years {df['Year'].min()} to {MAX_YEAR}.")
@@ -107,6 +174,61 @@ def initialize_database(csv_file: str):
         return None, None
 
 
+@st.cache_data(show_spinner=False)
+def run_query(_conn, sql: str, data_mtime: float) -> pd.DataFrame:
+    """
+    Executes a query against either backend and returns the result as a DataFrame.
+    Results are cached per SQL text and source file modification time; the
+    connection is underscore-prefixed so Streamlit does not try to hash it.
+    """
+    if duckdb is not None and isinstance(_conn, duckdb.DuckDBPyConnection):
+        # A cursor per call keeps the shared connection safe across Streamlit sessions
+        return _conn.cursor().execute(sql).df()
+    return pd.read_sql_query(sql, _conn)
+
+
+# (area, production) column pairs used by the Q4 correlation
+CORR_CROPS = {
+    'Rice': ('RiceArea', 'RiceProd'),
+    'Wheat': ('WheatArea', 'WheatProd'),
+    'Maize': ('MaizeArea', 'MaizeProd'),
+}
+
+
+def district_area_production_corr(data: pd.DataFrame, min_years: int = 5) -> pd.DataFrame:
+    """
+    Computes the per-district Pearson correlation between area and production
+    for each crop in CORR_CROPS. All moments are averaged in a single groupby
+    pass and combined as r = (E[xy] - E[x]E[y]) / (std(x) * std(y)).
+    Districts with `min_years` or fewer rows are dropped.
+    """
+    moments = {}
+    for crop, (area_col, prod_col) in CORR_CROPS.items():
+        x = data[area_col].astype('float64')
+        y = data[prod_col].astype('float64')
+        moments[(crop, 'x')] = x
+        moments[(crop, 'y')] = y
+        moments[(crop, 'xy')] = x * y
+        moments[(crop, 'xx')] = x * x
+        moments[(crop, 'yy')] = y * y
+
+    grouped = pd.DataFrame(moments).groupby(data['DistrictName'])
+    means = grouped.mean()
+    counts = grouped.size()
+
+    result = pd.DataFrame(index=means.index)
+    for crop in CORR_CROPS:
+        m = means[crop]
+        cov = m['xy'] - m['x'] * m['y']
+        var_x = (m['xx'] - m['x'] ** 2).clip(lower=0)
+        var_y = (m['yy'] - m['y'] ** 2).clip(lower=0)
+        denom = np.sqrt(var_x * var_y)
+        # Constant area or production (e.g. a crop never grown) has no defined correlation
+        result[f'{crop}_Area_Production_Corr'] = (cov / denom).where(denom > 0)
+
+    return result[counts > min_years].reset_index()
+
+
 # --- Main Streamlit App Logic ---
 
 def main():
@@ -172,12 +294,8 @@ def main():
         """,
 
         "Q4: District-wise Correlation Between Area and Production for Major Crops (Rice, Wheat, Maize)": f"""
-            SELECT DistrictName,
-                'N/A (Use external tool for correlation)' AS Correlation_Result
-            FROM {TABLE_NAME}
-            GROUP BY DistrictName
-            HAVING COUNT(Year) > 5
-            LIMIT 5;
+            SELECT DistrictName, RiceArea, RiceProd, WheatArea, WheatProd, MaizeArea, MaizeProd
+            FROM {TABLE_NAME};
         """,
 
         "Q5: Yearly Production Growth of Cotton in Top 5 Cotton Producing States": f"""
@@ -273,7 +391,11 @@ def main():
     # Execute the query
     try:
         # Execute the query and fetch the results into a DataFrame
-        result_df = pd.read_sql_query(selected_sql, conn)
+        result_df = run_query(conn, selected_sql, os.path.getmtime(source_file(CSV_FILE)))
+
+        # Q4 fetches the raw area/production pairs; the correlation itself is computed in pandas
+        if "Q4:" in selected_query_title:
+            result_df = district_area_production_corr(result_df)
 
         st.subheader("Results")
         if not result_df.empty:
@@ -2,11 +2,19 @@ import pandas as pd
 import numpy as np
 import re
 
-# --- 1. Load Data ---
-file_name = "ICRISAT-District Level Data - ICRISAT-District Level Data.csv"
-df = pd.read_csv(file_name)
+# --- 1. Define Column Cleaning Function ---
+
+# Unit indicators and the standardized suffix each one is replaced with
+_UNIT_SUFFIXES = {
+    '1000 ha': '_area_1000ha',
+    '1000 tons': '_production_1000tons',
+    'kg per ha': '_yield_kg_per_ha',
+}
+_P_UNIT = re.compile(r'\((1000 ha|1000 tons|kg per ha)\)')
+_P_PAREN = re.compile(r'[()\.]')
+# A spaced hyphen collapses to a single underscore, any other whitespace run to one
+_P_SEP = re.compile(r'\s+-\s+|\s+')
 
-# --- 2. Define Column Cleaning Function ---
 def clean_col_name(col_name):
     """
     Standardizes column names to snake_case, removes units,
@@ -14,29 +22,51 @@ def clean_col_name(col_name):
     """
     col_name = col_name.lower().strip()
     # Replace unit indicators with a standardized suffix
-    col_name = re.sub(r'\(1000 ha\)', '_area_1000ha', col_name)
-    col_name = re.sub(r'\(1000 tons\)', '_production_1000tons', col_name)
-    col_name = re.sub(r'\(kg per ha\)', '_yield_kg_per_ha', col_name)
-    col_name = re.sub(r'[()\.]', '', col_name) # Remove remaining parentheses and dots
-    col_name = re.sub(r'\s+', '_', col_name)   # Replace spaces with underscores
-    col_name = re.sub(r'_-_', '_', col_name)   # Clean up potential double underscores from hyphen
+    col_name = _P_UNIT.sub(lambda m: _UNIT_SUFFIXES[m.group(1)], col_name)
+    col_name = _P_PAREN.sub('', col_name)  # Remove remaining parentheses and dots
+    col_name = _P_SEP.sub('_', col_name)   # Replace spaces (and ' - ') with underscores
     return col_name
 
-# Apply the column name cleaning function
-df.columns = [clean_col_name(col) for col in df.columns]
-
-# --- 3. Handle Sentinel Values and Duplicates ---
-
-# Identify numerical columns for sentinel value replacement
-numerical_cols = df.select_dtypes(include=np.number).columns.tolist()
-
-# Replace sentinel value -1.0 with NaN in all numerical columns
-df[numerical_cols] = df[numerical_cols].replace(-1.0, np.nan)
-
-# Remove duplicates if any were found
+# --- 2. Load Data in Chunks, Handling Sentinel Values and Duplicates ---
+file_name = "ICRISAT-District Level Data - ICRISAT-District Level Data.csv"
+CHUNK_SIZE = 200_000
+
+# Clean the column names once from the header
+cleaned_columns = [clean_col_name(col) for col in pd.read_csv(file_name, nrows=0).columns]
+
+# Stream the file so only one raw chunk is held alongside the cleaned ones
+cleaned_chunks = []
+for chunk in pd.read_csv(file_name, chunksize=CHUNK_SIZE):
+    chunk.columns = cleaned_columns
+
+    # Sentinel value -1.0 marks missing data. Area and production are imputed
+    # with 0 in the same pass; other columns (yields) keep NaN for the later
+    # recalculation.
+    for col in chunk.select_dtypes(include=np.number).columns:
+        values = chunk[col].to_numpy()
+        if '_area_1000ha' in col or '_production_1000tons' in col:
+            missing = (values == -1.0) | np.isnan(values)
+            fill = 0.0
+        else:
+            missing = values == -1.0
+            fill = np.nan
+        if missing.any():
+            values = np.where(missing, fill, values)
+
+        # Area/production/yield values fit comfortably in float32
+        if values.dtype.kind == 'f':
+            values = pd.to_numeric(values, downcast='float')
+        chunk[col] = values
+
+    cleaned_chunks.append(chunk.drop_duplicates())
+
+df = pd.concat(cleaned_chunks, ignore_index=True)
+del cleaned_chunks
+
+# Remove duplicates spanning chunk boundaries
 df.drop_duplicates(inplace=True)
 
-# --- 4. Define Yield Triples and Imputation Logic ---
+# --- 3. Define Yield Triples and Imputation Logic ---
 
 # Identify all 'yield' columns
 yield_cols = [col for col in df.columns if 'yield_kg_per_ha' in col]
@@ -50,10 +80,6 @@ for yield_col in yield_cols:
     if area_col in df.columns and production_col in df.columns:
         yield_triples.append((yield_col, production_col, area_col))
 
-# Impute area and production NaNs with 0
-area_production_cols = [col for col in df.columns if '_area_1000ha' in col or '_production_1000tons' in col]
-df[area_production_cols] = df[area_production_cols].fillna(0)
-
 # Impute non-crop related area columns (assuming missing means zero)
 non_crop_area_cols = [
     'fruits_area_area_1000ha',
@@ -67,6 +93,14 @@ non_crop_area_cols = [
 # (e.g., 'fruits_area_1000ha' instead of 'fruits_area_area_1000ha').
 # For any expected non-crop area column, try to find an existing matching
 # column, attempt simple name fixes, or create the missing column with 0s.
+
+# Existing area columns keyed by the prefix before their first '_area'
+# (the first column wins when several share a prefix)
+area_by_prefix = {}
+for existing_col in df.columns:
+    if '_area_1000ha' in existing_col:
+        area_by_prefix.setdefault(existing_col.split('_area')[0], existing_col)
+
 fixed_cols = []
 mapped = {}
 for col in non_crop_area_cols:
@@ -81,14 +115,8 @@ for col in non_crop_area_cols:
         mapped[col] = candidate
         continue
 
-    # Fallback: try to find any column that contains the main keyword and is an area column
-    # Extract prefix before the first '_area'
-    prefix = col.split('_area')[0]
-    found = None
-    for existing_col in df.columns:
-        if prefix in existing_col and '_area_1000ha' in existing_col:
-            found = existing_col
-            break
+    # Fallback: look up an existing area column sharing the prefix before the first '_area'
+    found = area_by_prefix.get(col.split('_area')[0])
     if found:
         fixed_cols.append(found)
         mapped[col] = found
@@ -104,24 +132,48 @@ if mapped:
 # Finally, fill NaNs with 0 for the resolved set of columns
 df[fixed_cols] = df[fixed_cols].fillna(0)
 
-# --- 5. Final Yield Recalculation after Imputing Area/Production ---
+# --- 4. Final Yield Recalculation after Imputing Area/Production ---
 
 # Recalculate yield for any remaining NaN values using the imputed areas/productions.
 # Yield (kg/ha) = (Production (1000 tons) / Area (1000 ha)) * 1000
 for yield_col, production_col, area_col in yield_triples:
-    # Condition 1: Recalculate if yield is NaN and area is non-zero
-    recalc_condition = df[yield_col].isna() & (df[area_col] != 0)
-    df.loc[recalc_condition, yield_col] = (df[production_col] / df[area_col]) * 1000
+    yield_values = df[yield_col].to_numpy()
+    area = df[area_col].to_numpy()
+    production = df[production_col].to_numpy()
+
+    # Recalculate where area is non-zero, otherwise 0 (divisor guarded against zero)
+    recalculated = np.where(area != 0, production / np.where(area == 0, 1, area) * 1000, 0)
+
+    # Only fill the yields that are still missing
+    df[yield_col] = np.where(np.isnan(yield_values), recalculated, yield_values)
 
-    # Condition 2: Set yield to 0 if yield is NaN and area is 0
-    zero_yield_condition = df[yield_col].isna() & (df[area_col] == 0)
-    df.loc[zero_yield_condition, yield_col] = 0
+# --- 5. Downcast Dtypes ---
+
+# Chunks were downcast on load; this catches columns that were upcast
+# or created during imputation
+float_cols = df.select_dtypes(include='float').columns.tolist()
+for col in float_cols:
+    df[col] = pd.to_numeric(df[col], downcast='float')
+
+# Name columns (state, district) repeat across every year, so store them as
+# categories; Parquet keeps them dictionary-encoded for downstream groupbys
+for col in df.columns:
+    if col.endswith('_name') and not pd.api.types.is_numeric_dtype(df[col]):
+        df[col] = df[col].astype('category')
 
 # --- 6. Save Cleaned Data ---
 cleaned_file_name = "ICRISAT_District_Level_Data_Cleaned.csv"
 df.to_csv(cleaned_file_name, index=False)
 print(f"Cleaned data saved to {cleaned_file_name}")
 
+# Columnar, typed companion file; loaders pick this up in preference to the CSV
+parquet_file_name = "ICRISAT_District_Level_Data_Cleaned.parquet"
+try:
+    df.to_parquet(parquet_file_name, compression="snappy", engine="pyarrow", index=False)
+    print(f"Cleaned data saved to {parquet_file_name}")
+except ImportError:
+    print("pyarrow is not installed; skipping Parquet output.")
+
 # Display the final info (optional, for verification)
 print("\nFinal DataFrame Info:")
 df.info()
\ No newline at end of file
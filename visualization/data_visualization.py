@@ -1,22 +1,36 @@
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Only writes PNGs; skip GUI toolkit initialization
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import os
 import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 
 # Set plot style
 sns.set_style("whitegrid")
 plt.rcParams['figure.dpi'] = 100
+# Layout is only recomputed (an extra draw pass) for the plots whose labels
+# would otherwise spill past the default margins
+plt.rcParams['figure.autolayout'] = False
 
-# Load the cleaned dataset
+# Read only the header of the cleaned dataset; the full read below parses just
+# the columns the plots need
 file_name = "ICRISAT_District_Level_Data_Cleaned.csv"
-df = pd.read_csv(file_name)
+header = pd.read_csv(file_name, nrows=0).columns.tolist()
 
 # --- Robust column resolution ---
 # Some cleaned datasets may have slight naming variations (double underscores,
 # repeated segments like 'production_production' or 'area_area'). To keep the
 # rest of the script unchanged, map expected column names used below to actual
-# dataframe columns when possible, and create safe fallbacks when not found.
+# dataset columns when possible, and create safe fallbacks when not found.
+_NONALNUM = re.compile(r'[^a-z0-9_]')
+_MULTI_UND = re.compile(r'_+')
+
+@lru_cache(maxsize=512)
 def _normalize_col_name(name: str) -> str:
     n = str(name).lower().strip()
     # collapse duplicate segments that sometimes appear from earlier cleaning
@@ -25,8 +39,8 @@ def _normalize_col_name(name: str) -> str:
     n = n.replace('yield_yield', 'yield')
     # collapse multiple underscores and spaces
     n = n.replace('__', '_')
-    n = re.sub(r'[^a-z0-9_]', '_', n)
-    n = re.sub(r'_+', '_', n)
+    n = _NONALNUM.sub('_', n)
+    n = _MULTI_UND.sub('_', n)
     return n.strip('_')
 
 # List of expected column names that the script references below.
@@ -43,35 +57,33 @@ expected_cols = [
     'soyabean_yield_yield_kg_per_ha', 'rice_yield_yield_kg_per_ha', 'wheat_yield_yield_kg_per_ha'
 ]
 
-# Build normalized map of actual columns
-actual_norm_map = {col: _normalize_col_name(col) for col in df.columns}
-
-# Resolve expected -> actual column names
-resolved = {}
-created = []
-for exp in expected_cols:
-    exp_norm = _normalize_col_name(exp)
-    match = None
-    for actual, actual_norm in actual_norm_map.items():
-        if actual_norm == exp_norm:
-            match = actual
-            break
-    if match:
-        resolved[exp] = match
-    else:
-        # No exact normalized match: attempt a looser search by prefix + suffix
-        prefix = exp.split('_')[0]
-        candidates = [c for c in df.columns if prefix in c and ('production' in exp and 'production' in c or 'area' in exp and 'area' in c or 'yield' in exp and 'yield' in c)]
-        if candidates:
-            resolved[exp] = candidates[0]
+def resolve_columns(header):
+    """Maps each expected column name to an actual header column; returns (resolved, created)."""
+    # Build normalized -> actual map (the first column wins on collisions)
+    norm_to_actual = {}
+    for col in header:
+        norm_to_actual.setdefault(_normalize_col_name(col), col)
+
+    # Resolve expected -> actual column names
+    resolved = {}
+    created = []
+    for exp in expected_cols:
+        match = norm_to_actual.get(_normalize_col_name(exp))
+        if match:
+            resolved[exp] = match
         else:
-            # Create a safe fallback: production/area -> 0, yields -> NaN
-            if 'production' in exp or '_area_' in exp or exp.endswith('_1000ha'):
-                df[exp] = 0
+            # No exact normalized match: attempt a looser search by prefix + suffix
+            prefix = exp.split('_')[0]
+            candidates = [c for c in header if prefix in c and ('production' in exp and 'production' in c or 'area' in exp and 'area' in c or 'yield' in exp and 'yield' in c)]
+            if candidates:
+                resolved[exp] = candidates[0]
             else:
-                df[exp] = np.nan
-            resolved[exp] = exp
-            created.append(exp)
+                # A safe fallback column is created after loading
+                resolved[exp] = exp
+                created.append(exp)
+    return resolved, created
+
+resolved, created = resolve_columns(header)
 
 if resolved:
     print('Column resolution mapping (expected -> actual):')
@@ -81,31 +93,143 @@ if resolved:
     if created:
         print('Created fallback columns:', created)
 
-# For convenience, add aliases in the dataframe so later code can use the expected names
+# Load the resolved columns, with the multithreaded PyArrow parser when available
+NEEDED_COLS = [col for col in header if col in set(resolved.values())]
+# Narrow dtypes from the parser: names as categories, year as int16 and the
+# production/area/yield values as float32, halving the bytes each groupby scans
+NEEDED_DTYPES = {}
 for exp, actual in resolved.items():
-    if exp != actual and exp not in df.columns:
+    if actual not in NEEDED_COLS:
+        continue
+    if exp in ('state_name', 'dist_name'):
+        NEEDED_DTYPES[actual] = 'category'
+    elif exp == 'year':
+        NEEDED_DTYPES[actual] = 'int16'
+    else:
+        NEEDED_DTYPES[actual] = 'float32'
+try:
+    df = pd.read_csv(file_name, engine='pyarrow', usecols=NEEDED_COLS, dtype=NEEDED_DTYPES)
+except ImportError:
+    df = pd.read_csv(file_name, usecols=NEEDED_COLS, dtype=NEEDED_DTYPES)
+
+# Create safe fallbacks for unresolved columns: production/area -> 0, yields -> NaN
+for exp in created:
+    if 'production' in exp or '_area_' in exp or exp.endswith('_1000ha'):
+        df[exp] = np.float32(0)
+    else:
+        df[exp] = np.float32(np.nan)
+
+# Rename the loaded columns to the expected names so later code can use them;
+# only an actual column claimed by several expected names gets copied
+renames = {}
+for exp, actual in resolved.items():
+    if exp == actual or exp in df.columns:
+        continue
+    if actual in renames:
         df[exp] = df[actual]
+    else:
+        renames[actual] = exp
+df.rename(columns=renames, inplace=True)
+
+# State and district names repeat across every year; as categories the groupbys
+# and equality masks below work on integer codes instead of Python strings
+for col in ('state_name', 'dist_name'):
+    df[col] = df[col].astype('category')
+
+# --- Precomputed aggregations shared by the plots below ---
+PROD_COLS = [
+    'rice_production_production_1000tons', 'wheat_production_production_1000tons',
+    'oilseeds_production_production_1000tons', 'sunflower_production_production_1000tons',
+    'sugarcane_production_production_1000tons', 'maize_production_production_1000tons',
+    'groundnut_production_production_1000tons', 'soyabean_production_production_1000tons',
+    'pearl_millet_production_production_1000tons', 'finger_millet_production_production_1000tons',
+    'kharif_sorghum_production_production_1000tons', 'rabi_sorghum_production_production_1000tons'
+]
+AREA_COLS = ['rice_area_area_1000ha', 'wheat_area_area_1000ha', 'maize_area_area_1000ha']
+YIELD_COLS = ['soyabean_yield_yield_kg_per_ha', 'rice_yield_yield_kg_per_ha', 'wheat_yield_yield_kg_per_ha']
+
+def group_totals(frame, codes, keys, sum_cols, mean_cols=()):
+    """Per-group sums (and NaN-skipping means) of frame's columns via np.bincount; codes holds one group code per row of frame."""
+    valid = codes >= 0  # -1 marks a missing key
+    codes = codes[valid]
+    counts = np.bincount(codes, minlength=len(keys))
+    totals = {}
+    for col in sum_cols:
+        values = frame[col].to_numpy(dtype='float64')[valid]
+        totals[col] = np.bincount(codes, weights=np.nan_to_num(values), minlength=len(keys))
+    for col in mean_cols:
+        values = frame[col].to_numpy(dtype='float64')[valid]
+        present = ~np.isnan(values)
+        sums = np.bincount(codes, weights=np.where(present, values, 0), minlength=len(keys))
+        n = np.bincount(codes, weights=present, minlength=len(keys))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            totals[col] = sums / n
+    # Keep only the groups that occur in the data (like observed=True)
+    observed = counts > 0
+    return pd.DataFrame({col: v[observed] for col, v in totals.items()}, index=pd.Index(keys[observed]))
+
+# One pass per key column: per-state production totals and average yields,
+# and per-year production/area totals
+state_totals = group_totals(
+    df, df['state_name'].cat.codes.to_numpy(), df['state_name'].cat.categories.to_numpy(), PROD_COLS, YIELD_COLS
+)
+state_totals.index.name = 'state_name'
+year_codes, year_keys = pd.factorize(df['year'], sort=True)
+year_totals = group_totals(df, year_codes, np.asarray(year_keys), PROD_COLS + AREA_COLS)
+year_totals.index.name = 'year'
+
+# Plain string labels for plotting: seaborn lays out every category of a
+# categorical axis, including states missing from a top-N slice
+state_totals.index = state_totals.index.astype(str)
+
+# --- Shared figure reused by every plot below ---
+# Allocating and tearing down a figure per plot costs more than clearing one
+FIG = plt.figure(figsize=(10, 6))
+
+def new_axes(figsize=(10, 6), nrows=1, ncols=1):
+    """Clears the shared figure, resizes it and returns fresh axes for the next plot."""
+    FIG.clf()
+    FIG.set_size_inches(figsize)
+    return FIG.subplots(nrows, ncols)
+
+def save_fig(filename):
+    """Saves the shared figure as PNG; zlib level 1 encodes several times faster for slightly larger files."""
+    FIG.savefig(filename, dpi=100, pil_kwargs={'compress_level': 1})
+
+def bar_chart(ax, labels, values, palette, horizontal=False):
+    """Draws one bar per already-aggregated value, laid out like seaborn's categorical barplot."""
+    positions = np.arange(len(values))
+    # seaborn draws bars at 75% saturation
+    colors = sns.color_palette(palette, len(values), desat=0.75)
+    if horizontal:
+        ax.barh(positions, values, color=colors)
+        ax.set_yticks(positions, labels)
+        ax.set_ylim(len(values) - 0.5, -0.5)  # first label on top
+        ax.yaxis.grid(False)
+    else:
+        ax.bar(positions, values, color=colors)
+        ax.set_xticks(positions, labels)
+        ax.set_xlim(-0.5, len(values) - 0.5)
+        ax.xaxis.grid(False)
 
 # --- Common helper function for State Production EDA ---
-def plot_top_production(data, production_col, state_col, title, top_n, filename):
-    """Groups, sums, sorts, and plots top N states for a given production column."""
-    # Group by state and sum the production column over all years
-    state_prod = data.groupby(state_col)[production_col].sum().sort_values(ascending=False).head(top_n)
-
-    plt.figure(figsize=(10, 6))
-    sns.barplot(x=state_prod.values, y=state_prod.index, palette="viridis")
-    plt.xlabel(production_col.replace('_production_1000tons', '').replace('_', ' ').title() + ' (1000 tons)')
-    plt.ylabel('State Name')
-    plt.title(title)
-    plt.tight_layout()
-    plt.savefig(filename)
-    plt.close()
+def plot_top_production(state_totals, production_col, title, top_n, filename):
+    """Plots the top N states for a given production column from the precomputed state totals."""
+    state_prod = state_totals[production_col].nlargest(top_n)
+
+    ax = new_axes((10, 6))
+    bar_chart(ax, state_prod.index, state_prod.to_numpy(), "viridis", horizontal=True)
+    ax.set_xlabel(production_col.replace('_production_1000tons', '').replace('_', ' ').title() + ' (1000 tons)')
+    ax.set_ylabel('State Name')
+    ax.set_title(title)
+    FIG.tight_layout()
+    save_fig(filename)
 
 # --- 1. Top 7 RICE PRODUCTION State Data (Bar_plot) ---
-plot_top_production(
-    df,
+plot_rice_top = partial(
+    plot_top_production,
+    state_totals,
     'rice_production_production_1000tons',
-    'state_name',
     'Top 7 States for Rice Production (Total All Years)',
     7,
     'top_7_rice_production_bar.png'
@@ -113,169 +237,167 @@ plot_top_production(
 
 # --- 2. Top 5 Wheat Producing States Data (Bar_chart) and its percentage(%) (Pie_chart) ---
 WHEAT_PROD_COL = 'wheat_production_production_1000tons'
-top_n_wheat = 5
-wheat_prod_states = df.groupby('state_name')[WHEAT_PROD_COL].sum().sort_values(ascending=False).head(top_n_wheat)
-total_wheat_prod = wheat_prod_states.sum()
-wheat_prod_percent = (wheat_prod_states / total_wheat_prod) * 100
-
-# Bar Chart
-plt.figure(figsize=(10, 6))
-sns.barplot(x=wheat_prod_states.values, y=wheat_prod_states.index, palette="Reds_r")
-plt.xlabel('Wheat Production (1000 tons)')
-plt.ylabel('State Name')
-plt.title(f'Top {top_n_wheat} States for Wheat Production (Total All Years)')
-plt.tight_layout()
-plt.savefig('top_5_wheat_production_bar.png')
-plt.close()
-
-# Pie Chart
-plt.figure(figsize=(8, 8))
-plt.pie(
-    wheat_prod_percent,
-    labels=[f'{state} ({p:.1f}%)' for state, p in wheat_prod_percent.items()],
-    autopct='',
-    startangle=90,
-    wedgeprops={'edgecolor': 'black'},
-    colors=sns.color_palette("Reds_r", top_n_wheat)
-)
-plt.title(f'Percentage Share of Top {top_n_wheat} States in Total Wheat Production (of Top 5)')
-plt.tight_layout()
-plt.savefig('top_5_wheat_production_pie.png')
-plt.close()
+
+def plot_wheat_share():
+    top_n_wheat = 5
+    wheat_prod_states = state_totals[WHEAT_PROD_COL].nlargest(top_n_wheat)
+    total_wheat_prod = wheat_prod_states.sum()
+    wheat_prod_percent = (wheat_prod_states / total_wheat_prod) * 100
+
+    # Bar Chart
+    ax = new_axes((10, 6))
+    bar_chart(ax, wheat_prod_states.index, wheat_prod_states.to_numpy(), "Reds_r", horizontal=True)
+    ax.set_xlabel('Wheat Production (1000 tons)')
+    ax.set_ylabel('State Name')
+    ax.set_title(f'Top {top_n_wheat} States for Wheat Production (Total All Years)')
+    FIG.tight_layout()
+    save_fig('top_5_wheat_production_bar.png')
+
+    # Pie Chart
+    ax = new_axes((8, 8))
+    ax.pie(
+        wheat_prod_percent,
+        labels=[f'{state} ({p:.1f}%)' for state, p in zip(wheat_prod_percent.index.to_numpy(), wheat_prod_percent.to_numpy())],
+        autopct='',
+        startangle=90,
+        wedgeprops={'edgecolor': 'black'},
+        colors=sns.color_palette("Reds_r", top_n_wheat)
+    )
+    ax.set_title(f'Percentage Share of Top {top_n_wheat} States in Total Wheat Production (of Top 5)')
+    FIG.tight_layout()
+    save_fig('top_5_wheat_production_pie.png')
 
 # --- 3. Oil seed production by top 5 states / 13. Oilseed Production in Major States ---
-plot_top_production(
-    df,
+plot_oilseeds_top = partial(
+    plot_top_production,
+    state_totals,
     'oilseeds_production_production_1000tons',
-    'state_name',
     'Top 5 States for Oilseeds Production (Total All Years)',
     5,
     'top_5_oilseeds_production_bar.png'
 )
 
 # --- 4. Top 7 SUNFLOWER PRODUCTION State ---
-plot_top_production(
-    df,
+plot_sunflower_top = partial(
+    plot_top_production,
+    state_totals,
     'sunflower_production_production_1000tons',
-    'state_name',
     'Top 7 States for Sunflower Production (Total All Years)',
     7,
     'top_7_sunflower_production_bar.png'
 )
 
 # --- 5. India's SUGARCANE PRODUCTION From Last 50 Years (Line_plot) ---
-sugarcane_trend = df.groupby('year')['sugarcane_production_production_1000tons'].sum().reset_index()
-
-plt.figure(figsize=(12, 6))
-sns.lineplot(data=sugarcane_trend, x='year', y='sugarcane_production_production_1000tons', marker='o', color='forestgreen')
-plt.xlabel('Year')
-plt.ylabel('Sugarcane Production (1000 tons)')
-plt.title("India's Sugarcane Production Over Time (1966-2015)")
-plt.xticks(sugarcane_trend['year'][::5])
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('sugarcane_production_trend_line.png')
-plt.close()
+def plot_sugarcane_trend():
+    sugarcane_trend = year_totals[['sugarcane_production_production_1000tons']].reset_index()
+
+    ax = new_axes((12, 6))
+    ax.plot(sugarcane_trend['year'], sugarcane_trend['sugarcane_production_production_1000tons'], marker='o', markeredgecolor='w', markeredgewidth=0.75, color='forestgreen')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Sugarcane Production (1000 tons)')
+    ax.set_title("India's Sugarcane Production Over Time (1966-2015)")
+    ax.set_xticks(sugarcane_trend['year'][::5])
+    ax.grid(True)
+    save_fig('sugarcane_production_trend_line.png')
 
 # --- 6. Rice Production Vs Wheat Production (Last 50y) ---
-national_prod_trend = df.groupby('year').agg({
-    'rice_production_production_1000tons': 'sum',
-    'wheat_production_production_1000tons': 'sum'
-}).reset_index()
-
-plt.figure(figsize=(12, 6))
-sns.lineplot(data=national_prod_trend, x='year', y='rice_production_production_1000tons', label='Rice Production', marker='o', color='blue')
-sns.lineplot(data=national_prod_trend, x='year', y='wheat_production_production_1000tons', label='Wheat Production', marker='o', color='red')
-plt.xlabel('Year')
-plt.ylabel('Production (1000 tons)')
-plt.title('Rice Production Vs Wheat Production Over Time (1966-2015)')
-plt.xticks(national_prod_trend['year'][::5])
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('rice_vs_wheat_production_trend_line.png')
-plt.close()
+def plot_rice_vs_wheat_trend():
+    national_prod_trend = year_totals[[
+        'rice_production_production_1000tons',
+        'wheat_production_production_1000tons'
+    ]].reset_index()
+
+    ax = new_axes((12, 6))
+    ax.plot(national_prod_trend['year'], national_prod_trend['rice_production_production_1000tons'], label='Rice Production', marker='o', markeredgecolor='w', markeredgewidth=0.75, color='blue')
+    ax.plot(national_prod_trend['year'], national_prod_trend['wheat_production_production_1000tons'], label='Wheat Production', marker='o', markeredgecolor='w', markeredgewidth=0.75, color='red')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Production (1000 tons)')
+    ax.set_title('Rice Production Vs Wheat Production Over Time (1966-2015)')
+    ax.set_xticks(national_prod_trend['year'][::5])
+    ax.legend()
+    ax.grid(True)
+    save_fig('rice_vs_wheat_production_trend_line.png')
 
 # --- 7. Rice Production By West Bengal Districts ---
-west_bengal_df = df[df['state_name'] == 'West Bengal']
-wb_district_prod = west_bengal_df.groupby('dist_name')['rice_production_production_1000tons'].sum().sort_values(ascending=False)
-
-plt.figure(figsize=(10, 8))
-sns.barplot(x=wb_district_prod.values, y=wb_district_prod.index, palette="Blues_r")
-plt.xlabel('Rice Production (1000 tons)')
-plt.ylabel('District Name')
-plt.title('Rice Production by West Bengal Districts (Total All Years)')
-plt.tight_layout()
-plt.savefig('west_bengal_rice_production_districts_bar.png')
-plt.close()
+def plot_west_bengal_rice():
+    west_bengal_df = df[df['state_name'] == 'West Bengal']
+    wb_district_prod = west_bengal_df.groupby('dist_name', observed=True)['rice_production_production_1000tons'].sum().sort_values(ascending=False)
+    wb_district_prod.index = wb_district_prod.index.astype(str)
+
+    ax = new_axes((10, 8))
+    bar_chart(ax, wb_district_prod.index, wb_district_prod.to_numpy(), "Blues_r", horizontal=True)
+    ax.set_xlabel('Rice Production (1000 tons)')
+    ax.set_ylabel('District Name')
+    ax.set_title('Rice Production by West Bengal Districts (Total All Years)')
+    FIG.tight_layout()
+    save_fig('west_bengal_rice_production_districts_bar.png')
 
 # --- 8. Top 10 Wheat Production Years From UP ---
-up_df = df[df['state_name'] == 'Uttar Pradesh']
-up_yearly_wheat = up_df.groupby('year')['wheat_production_production_1000tons'].sum().sort_values(ascending=False).head(10)
-
-plt.figure(figsize=(10, 6))
-sns.barplot(x=up_yearly_wheat.index.astype(str), y=up_yearly_wheat.values, palette="Oranges_r")
-plt.xlabel('Year')
-plt.ylabel('Wheat Production (1000 tons)')
-plt.title('Top 10 Wheat Production Years in Uttar Pradesh')
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig('top_10_up_wheat_production_years_bar.png')
-plt.close()
+def plot_up_wheat_years():
+    up_df = df[df['state_name'] == 'Uttar Pradesh']
+    up_yearly_wheat = up_df.groupby('year', observed=True)['wheat_production_production_1000tons'].sum().nlargest(10)
+
+    ax = new_axes((10, 6))
+    bar_chart(ax, up_yearly_wheat.index.astype(str), up_yearly_wheat.to_numpy(), "Oranges_r")
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Wheat Production (1000 tons)')
+    ax.set_title('Top 10 Wheat Production Years in Uttar Pradesh')
+    ax.tick_params(axis='x', labelrotation=45)
+    save_fig('top_10_up_wheat_production_years_bar.png')
 
 # --- 9. Millet Production (Last 50y) ---
-df['total_millet_production'] = df['pearl_millet_production_production_1000tons'] + df['finger_millet_production_production_1000tons']
-millet_trend = df.groupby('year')['total_millet_production'].sum().reset_index()
-
-plt.figure(figsize=(12, 6))
-sns.lineplot(data=millet_trend, x='year', y='total_millet_production', marker='o', color='purple')
-plt.xlabel('Year')
-plt.ylabel('Millet Production (1000 tons)')
-plt.title('India\'s Total Millet Production Over Time (1966-2015)')
-plt.xticks(millet_trend['year'][::5])
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('millet_production_trend_line.png')
-plt.close()
+def plot_millet_trend():
+    # Add the two per-year totals (one row per year) instead of a full-frame column
+    millet_trend = year_totals[[
+        'pearl_millet_production_production_1000tons',
+        'finger_millet_production_production_1000tons'
+    ]].sum(axis=1).reset_index(name='total_millet_production')
+
+    ax = new_axes((12, 6))
+    ax.plot(millet_trend['year'], millet_trend['total_millet_production'], marker='o', markeredgecolor='w', markeredgewidth=0.75, color='purple')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Millet Production (1000 tons)')
+    ax.set_title('India\'s Total Millet Production Over Time (1966-2015)')
+    ax.set_xticks(millet_trend['year'][::5])
+    ax.grid(True)
+    save_fig('millet_production_trend_line.png')
 
 # --- 10. Sorghum Production (Kharif and Rabi) by Region ---
-sorghum_prod = df.groupby('state_name').agg({
-    'kharif_sorghum_production_production_1000tons': 'sum',
-    'rabi_sorghum_production_production_1000tons': 'sum'
-})
-sorghum_prod['total_sorghum'] = sorghum_prod.sum(axis=1)
-sorghum_prod_top = sorghum_prod.sort_values(by='total_sorghum', ascending=False).head(10).drop(columns=['total_sorghum'])
-
-sorghum_prod_top_melt = sorghum_prod_top.reset_index().melt(
-    id_vars='state_name',
-    var_name='Sorghum Type',
-    value_name='Production'
-).replace({
-    'kharif_sorghum_production_production_1000tons': 'Kharif Sorghum',
-    'rabi_sorghum_production_production_1000tons': 'Rabi Sorghum'
-})
-
-plt.figure(figsize=(12, 7))
-sns.barplot(
-    data=sorghum_prod_top_melt,
-    x='Production',
-    y='state_name',
-    hue='Sorghum Type',
-    palette={'Kharif Sorghum': 'orange', 'Rabi Sorghum': 'brown'}
-)
-plt.xlabel('Production (1000 tons)')
-plt.ylabel('State Name')
-plt.title('Kharif and Rabi Sorghum Production by Top 10 States (Total All Years)')
-plt.legend(title='Sorghum Type')
-plt.tight_layout()
-plt.savefig('sorghum_production_kharif_rabi_stacked_bar.png')
-plt.close()
+SORGHUM_COLS = ['kharif_sorghum_production_production_1000tons', 'rabi_sorghum_production_production_1000tons']
+
+def plot_sorghum():
+    sorghum_prod_top = state_totals[SORGHUM_COLS].assign(
+        total_sorghum=lambda x: x.sum(axis=1)
+    ).nlargest(10, 'total_sorghum')
+
+    # Long form built directly from the 10x2 slice: one (state, type) row per bar
+    sorghum_prod_top_melt = pd.DataFrame({
+        'state_name': np.repeat(sorghum_prod_top.index.to_numpy(), 2),
+        'Sorghum Type': np.tile(['Kharif Sorghum', 'Rabi Sorghum'], len(sorghum_prod_top)),
+        'Production': sorghum_prod_top[SORGHUM_COLS].to_numpy().ravel()
+    })
+
+    ax = new_axes((12, 7))
+    sns.barplot(
+        data=sorghum_prod_top_melt,
+        x='Production',
+        y='state_name',
+        hue='Sorghum Type',
+        palette={'Kharif Sorghum': 'orange', 'Rabi Sorghum': 'brown'},
+        ax=ax
+    )
+    ax.set_xlabel('Production (1000 tons)')
+    ax.set_ylabel('State Name')
+    ax.set_title('Kharif and Rabi Sorghum Production by Top 10 States (Total All Years)')
+    ax.legend(title='Sorghum Type')
+    FIG.tight_layout()
+    save_fig('sorghum_production_kharif_rabi_stacked_bar.png')
 
 # --- 11. Top 7 States for Groundnut Production ---
-plot_top_production(
-    df,
+plot_groundnut_top = partial(
+    plot_top_production,
+    state_totals,
     'groundnut_production_production_1000tons',
-    'state_name',
     'Top 7 States for Groundnut Production (Total All Years)',
     7,
     'top_7_groundnut_production_bar.png'
@@ -285,89 +407,108 @@ plot_top_production(
 SOYBEAN_PROD_COL = 'soyabean_production_production_1000tons'
 SOYBEAN_YIELD_COL = 'soyabean_yield_yield_kg_per_ha'
 
-# Calculate state aggregates: total production and average yield
-soybean_states = df.groupby('state_name').agg(
-    total_production=(SOYBEAN_PROD_COL, 'sum'),
-    average_yield=(SOYBEAN_YIELD_COL, 'mean')
-).sort_values(by='total_production', ascending=False).head(5)
-
-# Production Bar Chart
-plt.figure(figsize=(10, 6))
-sns.barplot(x=soybean_states.index, y=soybean_states['total_production'], palette="Greens_r")
-plt.xlabel('State Name')
-plt.ylabel('Soybean Production (1000 tons)')
-plt.title('Top 5 States for Soybean Production (Total All Years)')
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig('top_5_soybean_production_bar.png')
-plt.close()
-
-# Yield Efficiency Bar Chart
-plt.figure(figsize=(10, 6))
-sns.barplot(x=soybean_states.index, y=soybean_states['average_yield'].sort_values(ascending=False), palette="Blues_r")
-plt.xlabel('State Name')
-plt.ylabel('Average Soybean Yield (Kg per ha)')
-plt.title('Soybean Yield Efficiency by Top 5 Producing States (Average All Years)')
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig('top_5_soybean_yield_efficiency_bar.png')
-plt.close()
+def plot_soybean():
+    # Calculate state aggregates: total production and average yield
+    soybean_states = state_totals[[SOYBEAN_PROD_COL, SOYBEAN_YIELD_COL]].rename(columns={
+        SOYBEAN_PROD_COL: 'total_production',
+        SOYBEAN_YIELD_COL: 'average_yield'
+    }).nlargest(5, 'total_production')
+
+    # Production Bar Chart
+    ax = new_axes((10, 6))
+    bar_chart(ax, soybean_states.index, soybean_states['total_production'].to_numpy(), "Greens_r")
+    ax.set_xlabel('State Name')
+    ax.set_ylabel('Soybean Production (1000 tons)')
+    ax.set_title('Top 5 States for Soybean Production (Total All Years)')
+    ax.tick_params(axis='x', labelrotation=45)
+    FIG.tight_layout()
+    save_fig('top_5_soybean_production_bar.png')
+
+    # Yield Efficiency Bar Chart
+    ax = new_axes((10, 6))
+    # Sort the whole frame so each yield stays paired with its own state label
+    soybean_by_yield = soybean_states.sort_values('average_yield', ascending=False)
+    bar_chart(ax, soybean_by_yield.index, soybean_by_yield['average_yield'].to_numpy(), "Blues_r")
+    ax.set_xlabel('State Name')
+    ax.set_ylabel('Average Soybean Yield (Kg per ha)')
+    ax.set_title('Soybean Yield Efficiency by Top 5 Producing States (Average All Years)')
+    ax.tick_params(axis='x', labelrotation=45)
+    FIG.tight_layout()
+    save_fig('top_5_soybean_yield_efficiency_bar.png')
 
 # --- 14. Impact of Area Cultivated on Production (Rice, Wheat, Maize) ---
-area_prod_df = df.groupby('year').agg({
-    'rice_area_area_1000ha': 'sum',
-    'rice_production_production_1000tons': 'sum',
-    'wheat_area_area_1000ha': 'sum',
-    'wheat_production_production_1000tons': 'sum',
-    'maize_area_area_1000ha': 'sum',
-    'maize_production_production_1000tons': 'sum'
-}).reset_index()
-
-# Scatter Plot for Area vs. Production (National Totals)
-plt.figure(figsize=(15, 5))
-
-# Rice
-plt.subplot(1, 3, 1)
-sns.regplot(data=area_prod_df, x='rice_area_area_1000ha', y='rice_production_production_1000tons', scatter_kws={'alpha':0.6}, line_kws={'color':'red'})
-plt.title('Rice: Area vs. Production')
-plt.xlabel('Area Cultivated (1000 ha)')
-plt.ylabel('Production (1000 tons)')
-
-# Wheat
-plt.subplot(1, 3, 2)
-sns.regplot(data=area_prod_df, x='wheat_area_area_1000ha', y='wheat_production_production_1000tons', scatter_kws={'alpha':0.6}, line_kws={'color':'red'})
-plt.title('Wheat: Area vs. Production')
-plt.xlabel('Area Cultivated (1000 ha)')
-
-# Maize
-plt.subplot(1, 3, 3)
-sns.regplot(data=area_prod_df, x='maize_area_area_1000ha', y='maize_production_production_1000tons', scatter_kws={'alpha':0.6}, line_kws={'color':'red'})
-plt.title('Maize: Area vs. Production')
-plt.xlabel('Area Cultivated (1000 ha)')
-
-plt.suptitle('Impact of Area Cultivated on Production (National Totals Over Time)', fontsize=14)
-plt.tight_layout(rect=[0, 0, 1, 0.95])
-plt.savefig('area_vs_production_scatter.png')
-plt.close()
+def plot_area_vs_production():
+    # Scatter Plot for Area vs. Production (National Totals), with a least-squares
+    # line from np.polyfit instead of seaborn's bootstrapped regression
+    axes = new_axes((15, 5), 1, 3)
+    for crop, ax in zip(('rice', 'wheat', 'maize'), axes):
+        area = year_totals[f'{crop}_area_area_1000ha'].to_numpy()
+        production = year_totals[f'{crop}_production_production_1000tons'].to_numpy()
+        slope, intercept = np.polyfit(area, production, 1)
+        x_line = np.array([area.min(), area.max()])
+
+        ax.scatter(area, production, alpha=0.6)
+        ax.plot(x_line, slope * x_line + intercept, color='red')
+        ax.set_title(f'{crop.title()}: Area vs. Production')
+        ax.set_xlabel('Area Cultivated (1000 ha)')
+    axes[0].set_ylabel('Production (1000 tons)')
+
+    FIG.suptitle('Impact of Area Cultivated on Production (National Totals Over Time)', fontsize=14)
+    FIG.tight_layout(rect=[0, 0, 1, 0.95])
+    save_fig('area_vs_production_scatter.png')
 
 # --- 15. Rice vs. Wheat Yield Across States ---
-state_yields = df.groupby('state_name').agg(
-    rice_yield=('rice_yield_yield_kg_per_ha', 'mean'),
-    wheat_yield=('wheat_yield_yield_kg_per_ha', 'mean')
-).dropna()
-
-plt.figure(figsize=(10, 8))
-sns.scatterplot(data=state_yields, x='rice_yield', y='wheat_yield', hue=state_yields.index, legend=False, s=100)
-
-for i in range(len(state_yields)):
-    if (state_yields['rice_yield'].iloc[i] > state_yields['rice_yield'].quantile(0.75)) or \
-       (state_yields['wheat_yield'].iloc[i] > state_yields['wheat_yield'].quantile(0.75)):
-        plt.text(state_yields['rice_yield'].iloc[i] * 1.02, state_yields['wheat_yield'].iloc[i],
-                 state_yields.index[i], fontsize=8)
-
-plt.xlabel('Average Rice Yield (Kg per ha)')
-plt.ylabel('Average Wheat Yield (Kg per ha)')
-plt.title('Rice vs. Wheat Yield Across States (Average All Years)')
-plt.tight_layout()
-plt.savefig('rice_vs_wheat_yield_scatter.png')
-plt.close()
\ No newline at end of file
+def plot_yield_scatter():
+    state_yields = state_totals[['rice_yield_yield_kg_per_ha', 'wheat_yield_yield_kg_per_ha']].rename(columns={
+        'rice_yield_yield_kg_per_ha': 'rice_yield',
+        'wheat_yield_yield_kg_per_ha': 'wheat_yield'
+    }).dropna()
+
+    ax = new_axes((10, 8))
+    sns.scatterplot(data=state_yields, x='rice_yield', y='wheat_yield', hue=state_yields.index, legend=False, s=100, ax=ax)
+
+    # Label the states in the top quartile for either yield
+    rice = state_yields['rice_yield'].to_numpy()
+    wheat = state_yields['wheat_yield'].to_numpy()
+    states = state_yields.index.to_numpy()
+    highlight = (rice > np.quantile(rice, 0.75)) | (wheat > np.quantile(wheat, 0.75))
+    for i in np.flatnonzero(highlight):
+        ax.text(rice[i] * 1.02, wheat[i], states[i], fontsize=8)
+
+    ax.set_xlabel('Average Rice Yield (Kg per ha)')
+    ax.set_ylabel('Average Wheat Yield (Kg per ha)')
+    ax.set_title('Rice vs. Wheat Yield Across States (Average All Years)')
+    save_fig('rice_vs_wheat_yield_scatter.png')
+
+# --- Render all plots ---
+# The plots only read the precomputed frames, so they render independently.
+# Forked workers inherit the loaded data and their own copy of FIG; where fork
+# is unavailable (or there is a single core) they run one after another.
+TASKS = [
+    plot_rice_top,
+    plot_wheat_share,
+    plot_oilseeds_top,
+    plot_sunflower_top,
+    plot_sugarcane_trend,
+    plot_rice_vs_wheat_trend,
+    plot_west_bengal_rice,
+    plot_up_wheat_years,
+    plot_millet_trend,
+    plot_sorghum,
+    plot_groundnut_top,
+    plot_soybean,
+    plot_area_vs_production,
+    plot_yield_scatter,
+]
+
+MAX_WORKERS = min(len(TASKS), os.cpu_count() or 1)
+if MAX_WORKERS > 1 and 'fork' in multiprocessing.get_all_start_methods():
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context('fork')) as executor:
+        # Tasks are submitted by reference (a lambda would not pickle); result() re-raises worker errors
+        for future in [executor.submit(task) for task in TASKS]:
+            future.result()
+else:
+    for task in TASKS:
+        task()
+
+plt.close(FIG)
\ No newline at end of file